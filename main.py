@@ -9,21 +9,30 @@ import sys
 import os
 import re
 import json
+import time
 import logging
 import fnmatch
-from typing import List, Dict, Optional, Tuple
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple, Callable, Iterator, Union
 from dataclasses import dataclass, field
 
 from PySide6.QtWidgets import (
 	QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-	QPushButton, QLineEdit, QTextEdit, QFileDialog, QLabel, QMenu,
+	QPushButton, QLineEdit, QPlainTextEdit, QFileDialog, QLabel, QMenu,
 	QMessageBox, QStatusBar, QGroupBox, QSplitter, QProgressDialog,
-	QTreeWidget, QTreeWidgetItem, QHeaderView, QDialog, QTableWidget,
-	QTableWidgetItem, QDialogButtonBox, QAbstractItemView, QTabWidget,
-	QTreeWidgetItemIterator, QScrollArea, QCheckBox, QGridLayout
+	QTreeWidget, QTreeWidgetItem, QHeaderView, QDialog, QTableView,
+	QDialogButtonBox, QAbstractItemView, QTabWidget,
+	QTreeWidgetItemIterator, QScrollArea, QCheckBox, QGridLayout, QButtonGroup,
+	QAbstractButton
 )
 from PySide6.QtGui import QIcon, QTextCursor, QFont
-from PySide6.QtCore import Qt, QTimer, Signal, QThread, QByteArray, Slot
+from PySide6.QtCore import (
+	Qt, QTimer, Signal, QThread, QByteArray, Slot, QSignalBlocker,
+	QTranslator, QLocale, QLibraryInfo,
+	QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
 
 # 导入编译后的资源文件
 try:
@@ -33,13 +42,21 @@ except ImportError:
 	print("请先根据代码注释中的说明，创建并编译 `resources.qrc` 文件。")
 	sys.exit(1)
 
+# 可选依赖: orjson 的 JSON 序列化/反序列化比标准库快数倍，未安装时回退到 json
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
 
 # --- 1. 辅助函数 ---
  
+@functools.lru_cache(maxsize=None)
 def get_resource_path(relative_path: str) -> str:
     """
     获取资源的绝对路径，兼容源码运行和PyInstaller打包两种情况。
     对于PyInstaller的单文件（--onefile）模式，它会查找.exe文件所在的目录。
+    程序运行期间不会切换工作目录，结果按相对路径缓存。
     """
     if getattr(sys, 'frozen', False):
         # 打包后的路径
@@ -48,11 +65,86 @@ def get_resource_path(relative_path: str) -> str:
         # 源码运行的路径
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
+
+
+def dumps_json(obj) -> bytes:
+	"""将对象序列化为带缩进的 UTF-8 JSON 字节串"""
+	if orjson is not None:
+		return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+	return json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+
+def loads_json(data: bytes):
+	"""从 UTF-8 字节串反序列化 JSON"""
+	if orjson is not None:
+		return orjson.loads(data)
+	return json.loads(data)
+
+
+_ICON_CACHE: Dict[str, QIcon] = {}
+
+def get_icon(resource_path: str) -> QIcon:
+	"""返回资源图标，同一路径只解析一次 SVG，之后复用缓存的 QIcon"""
+	icon = _ICON_CACHE.get(resource_path)
+	if icon is None:
+		icon = QIcon(resource_path)
+		_ICON_CACHE[resource_path] = icon
+	return icon
+
+def read_text_file(path: str) -> str:
+	"""二进制一次读入后整体解码，结果与文本模式 (utf-8, errors='ignore') 读取一致"""
+	# 直接用文件描述符读取，省去为每个小文件创建缓冲文件对象的开销
+	fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+	try:
+		size = os.fstat(fd).st_size
+		raw = os.read(fd, size + 1) # 多读 1 字节，用来发现读取期间变大的文件
+		if len(raw) > size:
+			chunks = [raw]
+			while chunk := os.read(fd, 1 << 16):
+				chunks.append(chunk)
+			raw = b''.join(chunks)
+	finally:
+		os.close(fd)
+	content = raw.decode('utf-8', errors='ignore')
+	if '\r' in content: # 与文本模式的通用换行转换保持一致
+		content = content.replace('\r\n', '\n').replace('\r', '\n')
+	return content
+
+def write_text_file(path: str, content: str) -> None:
+	"""一次编码后用文件描述符写入 (覆盖)，省去缓冲文件对象；内容本身已是 '\n' 换行"""
+	data = memoryview(content.encode('utf-8'))
+	fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+	try:
+		while data: # os.write 可能只写入一部分
+			data = data[os.write(fd, data):]
+	finally:
+		os.close(fd)
+
+def read_text_files(paths: List[str]) -> List[Union[str, OSError, ValueError]]:
+	"""按顺序读取一批文件，单个文件失败时在对应位置返回异常而不中断整批"""
+	results = []
+	for path in paths:
+		try:
+			results.append(read_text_file(path))
+		except (OSError, ValueError) as e:
+			results.append(e)
+	return results
+
+def utf16_len(text: str) -> int:
+	"""文本在 Qt 文档中占用的位置数 (UTF-16 码元数)，BMP 以外的字符占两个位置"""
+	return len(text) if text.isascii() else len(text.encode('utf-16-le')) // 2
+
+def dir_nonempty(path: str) -> bool:
+	"""目录存在且至少有一个条目时返回 True，读到第一个条目就停止"""
+	try:
+		with os.scandir(path) as it:
+			return next(it, None) is not None
+	except (FileNotFoundError, NotADirectoryError):
+		return False
  
  
 # --- 2. 常量与核心数据结构 ---
  
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
 	"""使用 dataclass 定义文件信息，保持数据清晰"""
 	rel_path: str
@@ -60,17 +152,191 @@ class FileInfo:
 	language: str
 	comment_symbol: str
 	item_ref: Optional[QTreeWidgetItem] = field(default=None, repr=False) # 反向引用UI项
+	rendered_block: str = field(default='', init=False, repr=False, compare=False) # 预先生成的代码块文本
+
+	def __post_init__(self):
+		# 在创建处 (通常是工作线程) 一次性生成代码块，界面线程拼接时只做字符串连接
+		self.rendered_block = self.render_block()
+
+	def render_block(self) -> str:
+		"""生成该文件对应的代码块文本，并避免重复添加路径注释"""
+		content_to_write = self.content.strip()
+		
+		# 构造预期的注释行
+		expected_comment = ""
+		if "<!--" in self.comment_symbol:
+			expected_comment = f"<!-- {self.rel_path} -->"
+		elif self.comment_symbol:
+			expected_comment = f"{self.comment_symbol} {self.rel_path}"
+
+		# 检查内容是否已经以该注释行开头。
+		# 如果是，则从内容中移除它，因为我们会在外面统一添加，以确保格式统一。
+		if expected_comment and content_to_write.startswith(expected_comment):
+			content_to_write = content_to_write[len(expected_comment):].lstrip()
+		
+		# 统一添加注释行（如果需要）
+		final_comment_line = f"{expected_comment}\n" if expected_comment else ""
+
+		return f"```{self.language}\n{final_comment_line}{content_to_write}\n```\n"
 
 # 正则表达式
-CODE_BLOCK_PATTERN = re.compile(r"```(\w*)\n(.*?)\n\s*```", re.DOTALL)
-PATH_COMMENT_PATTERN = re.compile(r"^\s*(?:<!--\s*)?([#|//|;]+)?\s*(\S+)(?:\s*-->)?")
+# 代码块开头 "```lang\n" 中的语言标识部分，代码块本身由 iter_code_blocks 线性扫描
+FENCE_LANG_PATTERN = re.compile(r"(\w*)\n")
+# 首行路径注释: 注释符号用交替分支列出 ("/*" 与 "<!--" 也能整体捕获，HTML 注释的符号得以保留)
+PATH_COMMENT_PATTERN = re.compile(r"^\s*(<!--|/\*|--|[#/;]+)?\s*(\S+)(?:\s*-->)?")
 INVALID_PATH_CHARS_PATTERN = re.compile(r'[<>:"|?*]')
 
+def iter_code_blocks(text: str) -> Iterator[Tuple[str, str]]:
+	"""
+	逐个产出 (语言标识, 块内容)，结果与正则 ```(\\w*)\\n(.*?)\\n\\s*``` (DOTALL) 的 finditer 一致。
+	用 str.find 定位围栏，避免非贪婪 .*? 逐字符回溯。
+	"""
+	pos = 0
+	while True:
+		start = text.find('```', pos)
+		if start < 0: return
+		lang_match = FENCE_LANG_PATTERN.match(text, start + 3)
+		if not lang_match:
+			pos = start + 1
+			continue
+		body_start = lang_match.end()
+		# 找第一个前面紧跟 "换行+空白" 的结束围栏
+		close = text.find('```', body_start)
+		while close >= 0:
+			ws_start = close
+			while ws_start > body_start and text[ws_start - 1].isspace():
+				ws_start -= 1
+			body_end = text.find('\n', ws_start, close)
+			if body_end >= 0: break
+			close = text.find('```', close + 1)
+		else:
+			return # 之后不可能再有完整的代码块
+		yield lang_match.group(1), text[body_start:body_end]
+		pos = close + 3
+
+# 排除规则 ------------------------------------------------------------
+_GLOB_CHARS = frozenset('*?[')
+# 基本名称通配匹配结果的缓存容量 (__init__.py、index.js 等名称在项目中大量重复)
+_NAME_MATCH_CACHE_SIZE = 4096
+# 按名称/路径分别查找的表: (字面量 -> 规则序号, 字面量 -> 规则序号, 名称 -> 命中的通配规则序号 (-1 为未命中), 通配路径匹配)
+_ExclusionTables = Tuple[Dict[str, int], Dict[str, int],
+						 Optional[Callable[[str], int]], Optional[Callable[[str], Optional[re.Match]]]]
+
+def parse_exclusions(exclude_str: str) -> List[str]:
+	"""解析排除字符串为模式列表，忽略空行和注释。"""
+	patterns = []
+	# 支持逗号和换行符作为分隔符 (只按这两个字符切分；splitlines 还会切分 \r 等字符，结果不同)
+	for line in exclude_str.replace(',', '\n').split('\n'):
+		line = line.strip()
+		if line and not line.startswith('#'):
+			patterns.append(line)
+	return patterns
+
+class ExclusionMatcher:
+	"""
+	预编译的 .gitignore 风格排除规则。
+	- 后匹配的规则会覆盖先匹配的规则。
+	- `!` 前缀表示否定匹配。
+	- `/` 后缀表示只匹配目录。
+	- 模式不含斜杠时匹配任意层级的基本名称，包含斜杠时从根开始匹配相对路径。
+
+	不含通配符的模式放进字典做 O(1) 查找；其余模式按序号倒序合并成一个正则，
+	第一个命中的分组就是最后一条匹配的规则。文件和目录各有一套表 (仅目录规则不参与文件匹配)，
+	没有任何适用规则时该套表为 None，直接判定为不排除。
+	"""
+	__slots__ = ('_negate', '_file_tables', '_dir_tables')
+
+	def __init__(self, patterns: List[str]):
+		rules = [] # (是否否定, 是否仅匹配目录, 是否含斜杠, 规范化后的模式)
+		for pattern in patterns:
+			negate = pattern.startswith('!')
+			if negate:
+				pattern = pattern[1:]
+
+			# 规范化模式：移除尾部斜杠，但记录下来
+			is_dir_pattern = pattern.endswith('/')
+			if is_dir_pattern:
+				pattern = pattern.rstrip('/')
+
+			# 与 fnmatch.fnmatch 一致：模式和待匹配路径都经过 normcase
+			rules.append((negate, is_dir_pattern, '/' in pattern, os.path.normcase(pattern)))
+
+		self._negate = [rule[0] for rule in rules]
+		self._file_tables = self._build_tables([(i, rule) for i, rule in enumerate(rules) if not rule[1]])
+		self._dir_tables = self._build_tables(list(enumerate(rules)))
+
+	@staticmethod
+	def _build_tables(indexed_rules) -> Optional[_ExclusionTables]:
+		if not indexed_rules:
+			return None
+		name_literals: Dict[str, int] = {}
+		path_literals: Dict[str, int] = {}
+		name_globs, path_globs = [], []
+		for index, (_, _, has_slash, pattern) in indexed_rules:
+			if _GLOB_CHARS.isdisjoint(pattern):
+				(path_literals if has_slash else name_literals)[pattern] = index # 后出现的序号覆盖先出现的
+			else:
+				(path_globs if has_slash else name_globs).append((index, pattern))
+		return (name_literals, path_literals,
+				ExclusionMatcher._cached_name_lookup(ExclusionMatcher._combine_globs(name_globs)),
+				ExclusionMatcher._combine_globs(path_globs))
+
+	@staticmethod
+	def _combine_globs(indexed_globs) -> Optional[Callable[[str], Optional[re.Match]]]:
+		if not indexed_globs:
+			return None
+		# 序号大的排在前面，分组名记录规则序号
+		alternatives = [f"(?P<r{index}>{fnmatch.translate(pattern)})" for index, pattern in reversed(indexed_globs)]
+		return re.compile('|'.join(alternatives)).match
+
+	@staticmethod
+	def _cached_name_lookup(name_match) -> Optional[Callable[[str], int]]:
+		"""基本名称的匹配结果与所在路径无关，按名称缓存命中的规则序号"""
+		if name_match is None:
+			return None
+
+		@functools.lru_cache(maxsize=_NAME_MATCH_CACHE_SIZE)
+		def lookup(name: str) -> int:
+			match = name_match(name)
+			return int(match.lastgroup[1:]) if match else -1
+		return lookup
+
+	def is_excluded(self, rel_path: str, name: str, is_dir: bool) -> bool:
+		"""rel_path 为以 '/' 分隔的相对路径，name 为其最后一段"""
+		tables = self._dir_tables if is_dir else self._file_tables
+		if tables is None:
+			return False
+		name_literals, path_literals, name_lookup, path_match = tables
+		norm_name = os.path.normcase(name)
+		norm_rel_path = os.path.normcase(rel_path)
+
+		last = max(name_literals.get(norm_name, -1), path_literals.get(norm_rel_path, -1))
+		if name_lookup:
+			last = max(last, name_lookup(norm_name))
+		if path_match and (match := path_match(norm_rel_path)):
+			last = max(last, int(match.lastgroup[1:]))
+		return last >= 0 and not self._negate[last]
+
+@functools.lru_cache(maxsize=16)
+def compile_exclusions(exclude_str: str) -> ExclusionMatcher:
+	"""按原始排除字符串缓存编译结果，重复运行无需重新解析和编译"""
+	return ExclusionMatcher(parse_exclusions(exclude_str))
+
+# 并行读取源文件: 每个线程任务读取一批文件以摊薄调度开销 (文件读取会释放 GIL)
+READ_BATCH_SIZE = 32
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 每个任务最多发出约这么多次进度信号 (跨线程信号逐个排队，逐文件发送会挤占界面事件)
+PROGRESS_EMIT_COUNT = 200
+
+# 保存合并文本时每次编码写入的字符数
+SAVE_CHUNK_CHARS = 1 << 20
+
 # 默认配置文件名
 CONFIG_FILE_NAME = "config.json"
 
-# 默认后缀映射表
-DEFAULT_SUFFIX_MAP = {
+# 默认后缀映射表 (只读视图，防止运行期被意外修改；需要可变副本时使用 copy_default_suffix_map)
+DEFAULT_SUFFIX_MAP = MappingProxyType({
 	".py": {"language": "python", "comment": "#"},
 	".js": {"language": "javascript", "comment": "//"},
 	".ts": {"language": "typescript", "comment": "//"},
@@ -88,7 +354,12 @@ DEFAULT_SUFFIX_MAP = {
 	".sh": {"language": "bash", "comment": "#"},
 	".ini": {"language": "ini", "comment": ";"},
 	".txt": {"language": "text", "comment": "#"},
-}
+})
+DEFAULT_SUFFIXES = tuple(DEFAULT_SUFFIX_MAP)
+
+def copy_default_suffix_map() -> Dict[str, dict]:
+	"""返回默认映射的可变副本，内层字典也一并复制"""
+	return {suffix: dict(data) for suffix, data in DEFAULT_SUFFIX_MAP.items()}
 
 # 图标路径映射
 FILE_ICON_MAP = {
@@ -127,25 +398,95 @@ class ProjectTreeWidget(QTreeWidget):
 		super().dropEvent(event)
 		self.order_changed.emit()
 
+class SuffixMapModel(QAbstractTableModel):
+	"""后缀映射的表格模型，数据保存在一个简单的行列表中，由视图按需读取"""
+	HEADERS = ["后缀", "语言标识", "注释符号"]
+
+	def __init__(self, current_map: dict, parent=None):
+		super().__init__(parent)
+		self._rows: List[List[str]] = []
+		self.set_map(current_map)
+
+	def set_map(self, suffix_map: dict):
+		"""一次性重置模型数据"""
+		self.beginResetModel()
+		self._rows = [
+			[suffix, data.get('language', ''), data.get('comment', '')]
+			for suffix, data in sorted(suffix_map.items())
+		]
+		self.endResetModel()
+
+	def rows(self) -> List[List[str]]:
+		return self._rows
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self._rows)
+
+	def columnCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.HEADERS)
+
+	def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+		if not index.isValid():
+			return None
+		if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+			return self._rows[index.row()][index.column()]
+		return None
+
+	def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+		if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+			return False
+		self._rows[index.row()][index.column()] = str(value)
+		self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+		return True
+
+	def flags(self, index):
+		if not index.isValid():
+			return Qt.ItemFlag.NoItemFlags
+		return Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+	def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+		if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+			return self.HEADERS[section]
+		return super().headerData(section, orientation, role)
+
+	def insertRows(self, row, count, parent=QModelIndex()):
+		self.beginInsertRows(parent, row, row + count - 1)
+		for _ in range(count):
+			self._rows.insert(row, ["", "", ""])
+		self.endInsertRows()
+		return True
+
+	def removeRows(self, row, count, parent=QModelIndex()):
+		self.beginRemoveRows(parent, row, row + count - 1)
+		del self._rows[row:row + count]
+		self.endRemoveRows()
+		return True
+
+
 class SuffixMapEditorDialog(QDialog):
 	"""用于编辑后缀、语言和注释映射的对话框"""
 	def __init__(self, current_map: dict, parent=None):
 		super().__init__(parent)
 		self.setWindowTitle("编辑后缀映射")
-		self.setWindowIcon(QIcon(":/icons/edit.svg"))
+		self.setWindowIcon(get_icon(":/icons/edit.svg"))
 		self.setMinimumSize(550, 450)
 		self._edited_map = {k: v.copy() for k, v in current_map.items()}
 
-		self.table_widget = QTableWidget(0, 3)
-		self.table_widget.setHorizontalHeaderLabels(["后缀", "语言标识", "注释符号"])
-		header = self.table_widget.horizontalHeader()
+		# 使用 Model/View 替代 QTableWidget，避免为每个单元格创建 item
+		self.model = SuffixMapModel({}, self)
+		self.proxy_model = QSortFilterProxyModel(self)
+		self.proxy_model.setSourceModel(self.model)
+		self.table_view = QTableView()
+		self.table_view.setModel(self.proxy_model)
+		header = self.table_view.horizontalHeader()
 		header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
 		header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
 		header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
-		self.table_widget.setSortingEnabled(True)
+		self.table_view.setSortingEnabled(True)
+		self.table_view.sortByColumn(-1, Qt.SortOrder.AscendingOrder) # 保持模型的原始顺序
 
-		self.add_btn = QPushButton(QIcon(":/icons/edit.svg"), " 添加行")
-		self.remove_btn = QPushButton(QIcon(":/icons/clear-all.svg"), " 删除选中行")
+		self.add_btn = QPushButton(get_icon(":/icons/edit.svg"), " 添加行")
+		self.remove_btn = QPushButton(get_icon(":/icons/clear-all.svg"), " 删除选中行")
 		self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
 
 		layout = QVBoxLayout(self)
@@ -154,7 +495,7 @@ class SuffixMapEditorDialog(QDialog):
 		btn_layout.addWidget(self.remove_btn)
 		btn_layout.addStretch()
 		layout.addLayout(btn_layout)
-		layout.addWidget(self.table_widget)
+		layout.addWidget(self.table_view)
 		layout.addWidget(self.button_box)
 
 		self._populate_table()
@@ -167,33 +508,28 @@ class SuffixMapEditorDialog(QDialog):
 		self.button_box.rejected.connect(self.reject)
 
 	def _populate_table(self):
-		self.table_widget.setSortingEnabled(False)
-		for suffix, data in sorted(self._edited_map.items()):
-			self._add_row(suffix, data.get('language', ''), data.get('comment', ''))
-		self.table_widget.setSortingEnabled(True)
-
-	def _add_row(self, suffix="", lang="", comment=""):
-		row = self.table_widget.rowCount()
-		self.table_widget.insertRow(row)
-		self.table_widget.setItem(row, 0, QTableWidgetItem(suffix))
-		self.table_widget.setItem(row, 1, QTableWidgetItem(lang))
-		self.table_widget.setItem(row, 2, QTableWidgetItem(comment))
+		self.model.set_map(self._edited_map)
+
+	def _add_row(self):
+		row = self.model.rowCount()
+		self.model.insertRows(row, 1)
+		proxy_index = self.proxy_model.mapFromSource(self.model.index(row, 0))
+		self.table_view.scrollTo(proxy_index)
+		self.table_view.edit(proxy_index)
 
 	def _remove_row(self):
-		rows = sorted({index.row() for index in self.table_widget.selectedIndexes()}, reverse=True)
+		selected = self.table_view.selectionModel().selectedIndexes()
+		rows = sorted({self.proxy_model.mapToSource(index).row() for index in selected}, reverse=True)
 		for row in rows:
-			self.table_widget.removeRow(row)
+			self.model.removeRows(row, 1)
 
 	def _validate_and_accept(self):
 		new_map = {}
-		for row in range(self.table_widget.rowCount()):
-			suffix_item = self.table_widget.item(row, 0)
-			lang_item = self.table_widget.item(row, 1)
-			comment_item = self.table_widget.item(row, 2)
-			
-			suffix = suffix_item.text().strip() if suffix_item else ""
-			lang = lang_item.text().strip() if lang_item else ""
-			comment = comment_item.text().strip() if comment_item else ""
+		rows = self.model.rows()
+		# 按视图中的显示顺序校验，排序后提示的行号仍与用户看到的一致
+		for row in range(self.proxy_model.rowCount()):
+			source_row = self.proxy_model.mapToSource(self.proxy_model.index(row, 0)).row()
+			suffix, lang, comment = (value.strip() for value in rows[source_row])
 
 			if not suffix.startswith('.') or len(suffix) < 2:
 				QMessageBox.warning(self, "验证错误", f"第 {row+1} 行: 后缀必须以 '.' 开头且至少包含一个字符。")
@@ -218,6 +554,7 @@ class Worker(QThread):
 	finished = Signal(object)      # 任务完成时发射，携带结果
 	error = Signal(str)          # 发生错误时发射，携带错误信息
 	progress = Signal(int, str)  # 报告进度 (当前索引, 当前文件路径)
+	total_changed = Signal(int)  # 任务总量确定后发射 (例如扫描完源目录后)
 
 	def __init__(self, func, *args, **kwargs):
 		super().__init__()
@@ -247,30 +584,74 @@ class Worker(QThread):
 
 class ProjectPackerTool(QMainWindow):
 	"""主应用窗口类，整合了所有功能"""
+	_cached_style_sheet: Optional[str] = None # 已读取的 QSS 内容，在所有窗口实例间共享
+
 	def __init__(self):
 		super().__init__()
 
 		self.file_data: List[FileInfo] = []
 		self.config: Dict[str, any] = {}
 		self.config_file_path = get_resource_path(CONFIG_FILE_NAME)
+		self._last_saved_payload: Optional[bytes] = None # 最近一次写入磁盘的配置内容，用于跳过无变化的保存
+		self._sorted_suffix_keys_cache: Optional[List[str]] = None # 排序后的后缀列表，映射变化时失效
+		self._suffix_map_display_text: Optional[str] = None # 映射展示区当前显示的文本
+		self._block_ranges: Optional[Dict[str, Tuple[int, int]]] = None # rel_path -> 代码块在预览区中的 (起, 止) 位置，文本被编辑后失效
 		self._block_signals = False
 		self.worker: Optional[Worker] = None
 		self.progress_dialog: Optional[QProgressDialog] = None
-		self.suffix_checkboxes: List[QCheckBox] = []
+		self._dir_dialog: Optional[QFileDialog] = None # 复用的目录选择对话框
+		self._save_dialog: Optional[QFileDialog] = None # 复用的保存对话框，会记住上次的目录
+		self.suffix_checkboxes: Dict[str, QCheckBox] = {}
+		self._checked_suffixes: set = set() # 当前勾选后缀的缓存，由复选框信号增量维护
+		self._suffix_stretch_row = -1
+		self._checkbox_pool: List[QCheckBox] = [] # 暂时不用的复选框，后缀映射变化时优先复用
+		self._dir_status_cache: Optional[Tuple[str, bool]] = None # (源目录文本, 是否为目录)，避免每次刷新按钮都触发 stat
+		self._last_progress_ts = 0.0       # 上次刷新进度条数值的时间
+		self._last_progress_label_ts = 0.0 # 上次刷新进度条文字的时间
+
+		# 配置保存的防抖定时器：连续输入时只会在停止后保存一次
+		self._save_config_timer = QTimer(self)
+		self._save_config_timer.setSingleShot(True)
+		self._save_config_timer.setInterval(750)
+		self._save_config_timer.timeout.connect(self._save_pending_config)
+		self._config_dirty = False # 自上次保存以来是否有待保存的修改
+
+		# 源目录输入的防抖定时器：停止输入 200ms 后才检查目录是否存在，连续输入时不逐键访问文件系统
+		self._source_dir_timer = QTimer(self)
+		self._source_dir_timer.setSingleShot(True)
+		self._source_dir_timer.setInterval(200)
+		self._source_dir_timer.timeout.connect(self._update_button_states)
+
+		# 拖放排序后延迟重建预览文本：连续拖放时只在停下 200ms 后重建一次
+		self._regen_timer = QTimer(self)
+		self._regen_timer.setSingleShot(True)
+		self._regen_timer.setInterval(200)
+		self._regen_timer.timeout.connect(self._regenerate_combined_text)
 		
+		self._init_finished = False
+		
+		# 构造函数只搭建界面骨架，使窗口能尽快显示
 		self._load_config()
 		self._init_ui()
-		self._connect_signals()
 		self._apply_styles()
-		self._update_ui_from_config()
-		self._update_button_states()
 
 		self.setWindowTitle("项目文件打包与重建工具")
-		self.setWindowIcon(QIcon(':/icons/app-icon.svg'))
+		self.setWindowIcon(get_icon(':/icons/app-icon.svg'))
 		self.setGeometry(100, 100, 1500, 850)
+		self._restore_window_state()
 		self.setStatusBar(QStatusBar())
 		self.statusBar().showMessage("准备就绪。欢迎使用！")
 
+		# 较重的初始化 (创建后缀复选框等) 推迟到事件循环的下一轮执行
+		QTimer.singleShot(0, self._finish_init)
+
+	def _finish_init(self):
+		"""窗口首次显示后再完成剩余的初始化"""
+		self._connect_signals()
+		self._update_ui_from_config()
+		self._update_button_states()
+		self._init_finished = True
+
 	def _init_ui(self):
 		central_widget = QWidget()
 		self.setCentralWidget(central_widget)
@@ -290,9 +671,9 @@ class ProjectPackerTool(QMainWindow):
 		reconstruct_tab = QWidget()
 		config_tab = QWidget()
 		
-		self.tabs.addTab(pack_tab, QIcon(":/icons/pack.svg"), "打包项目")
-		self.tabs.addTab(reconstruct_tab, QIcon(":/icons/build.svg"), "重建项目")
-		self.tabs.addTab(config_tab, QIcon(":/icons/config.svg"), "高级配置")
+		self.tabs.addTab(pack_tab, get_icon(":/icons/pack.svg"), "打包项目")
+		self.tabs.addTab(reconstruct_tab, get_icon(":/icons/build.svg"), "重建项目")
+		self.tabs.addTab(config_tab, get_icon(":/icons/config.svg"), "高级配置")
 
 		self._create_pack_tab(pack_tab)
 		self._create_reconstruct_tab(reconstruct_tab)
@@ -317,10 +698,10 @@ class ProjectPackerTool(QMainWindow):
 		text_layout = QVBoxLayout(text_group)
 		
 		text_actions_layout = QHBoxLayout()
-		self.copy_to_clipboard_btn = QPushButton(QIcon(":/icons/clipboard.svg"), " 复制")
-		self.parse_text_btn = QPushButton(QIcon(":/icons/parse.svg"), " 解析")
-		self.save_text_btn = QPushButton(QIcon(":/icons/save.svg"), " 保存")
-		self.clear_all_btn = QPushButton(QIcon(":/icons/clear-all.svg"), " 清空")
+		self.copy_to_clipboard_btn = QPushButton(get_icon(":/icons/clipboard.svg"), " 复制")
+		self.parse_text_btn = QPushButton(get_icon(":/icons/parse.svg"), " 解析")
+		self.save_text_btn = QPushButton(get_icon(":/icons/save.svg"), " 保存")
+		self.clear_all_btn = QPushButton(get_icon(":/icons/clear-all.svg"), " 清空")
 		
 		text_actions_layout.addStretch()
 		text_actions_layout.addWidget(self.copy_to_clipboard_btn)
@@ -328,8 +709,9 @@ class ProjectPackerTool(QMainWindow):
 		text_actions_layout.addWidget(self.save_text_btn)
 		text_actions_layout.addWidget(self.clear_all_btn)
 
-		self.text_area = QTextEdit()
-		self.text_area.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+		# QPlainTextEdit 按行布局，只排版可见区域，跳转/滚动大文本远快于 QTextEdit 的富文本布局
+		self.text_area = QPlainTextEdit()
+		self.text_area.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
 		
 		text_layout.addLayout(text_actions_layout)
 		text_layout.addWidget(self.text_area)
@@ -351,7 +733,7 @@ class ProjectPackerTool(QMainWindow):
 		layout.addWidget(QLabel("1. 选择项目源目录:"))
 		source_layout = QHBoxLayout()
 		self.source_dir_edit = QLineEdit()
-		self.browse_source_btn = QPushButton(QIcon(":/icons/browse-folder.svg"), "")
+		self.browse_source_btn = QPushButton(get_icon(":/icons/browse-folder.svg"), "")
 		source_layout.addWidget(self.source_dir_edit)
 		source_layout.addWidget(self.browse_source_btn)
 		layout.addLayout(source_layout)
@@ -371,6 +753,10 @@ class ProjectPackerTool(QMainWindow):
 		self.suffix_grid_layout.setContentsMargins(5, 5, 5, 5)
 
 		self.suffix_scroll_area.setWidget(scroll_content)
+
+		# 所有后缀复选框放入同一个非互斥按钮组，只需连接一次 buttonToggled 信号
+		self.suffix_button_group = QButtonGroup(self)
+		self.suffix_button_group.setExclusive(False)
 		layout.addWidget(self.suffix_scroll_area)
 		
 		checklist_btn_layout = QHBoxLayout()
@@ -386,7 +772,7 @@ class ProjectPackerTool(QMainWindow):
 		layout.addWidget(self.exclude_edit)
 		
 		layout.addStretch()
-		self.extract_btn = QPushButton(QIcon(":/icons/pack.svg"), " 开始打包")
+		self.extract_btn = QPushButton(get_icon(":/icons/pack.svg"), " 开始打包")
 		self.extract_btn.setObjectName("action_button")
 		layout.addWidget(self.extract_btn)
 
@@ -398,13 +784,13 @@ class ProjectPackerTool(QMainWindow):
 		layout.addWidget(QLabel("1. 选择重建输出目录:"))
 		output_layout = QHBoxLayout()
 		self.output_dir_edit = QLineEdit(os.path.abspath("reconstructed_project"))
-		self.browse_output_btn = QPushButton(QIcon(":/icons/browse-folder.svg"), "")
+		self.browse_output_btn = QPushButton(get_icon(":/icons/browse-folder.svg"), "")
 		output_layout.addWidget(self.output_dir_edit)
 		output_layout.addWidget(self.browse_output_btn)
 		layout.addLayout(output_layout)
 		
 		layout.addStretch()
-		self.reconstruct_btn = QPushButton(QIcon(":/icons/build.svg"), " 开始重建")
+		self.reconstruct_btn = QPushButton(get_icon(":/icons/build.svg"), " 开始重建")
 		self.reconstruct_btn.setObjectName("action_button")
 		layout.addWidget(self.reconstruct_btn)
 
@@ -414,14 +800,14 @@ class ProjectPackerTool(QMainWindow):
 		layout.setContentsMargins(5, 15, 5, 5)
 
 		layout.addWidget(QLabel("后缀与语言/注释映射:"))
-		self.suffix_map_display = QTextEdit()
+		self.suffix_map_display = QPlainTextEdit()
 		self.suffix_map_display.setReadOnly(True)
 		self.suffix_map_display.setFont(QFont("Courier New", 10))
 		layout.addWidget(self.suffix_map_display)
 		
 		config_btn_layout = QHBoxLayout()
-		self.edit_map_btn = QPushButton(QIcon(":/icons/edit.svg"), " 编辑映射")
-		self.reset_map_btn = QPushButton(QIcon(":/icons/reset.svg"), " 重置为默认")
+		self.edit_map_btn = QPushButton(get_icon(":/icons/edit.svg"), " 编辑映射")
+		self.reset_map_btn = QPushButton(get_icon(":/icons/reset.svg"), " 重置为默认")
 		config_btn_layout.addWidget(self.edit_map_btn)
 		config_btn_layout.addWidget(self.reset_map_btn)
 		layout.addLayout(config_btn_layout)
@@ -443,10 +829,11 @@ class ProjectPackerTool(QMainWindow):
 		self.deselect_all_btn.clicked.connect(lambda: self._set_all_suffixes_checked(False))
 
 		# 输入变化
-		self.source_dir_edit.textChanged.connect(self._update_button_states)
+		self.source_dir_edit.textChanged.connect(self._on_source_dir_changed)
 		self.output_dir_edit.textChanged.connect(self._update_button_states)
-		self.text_area.textChanged.connect(self._update_button_states)
+		self.text_area.textChanged.connect(self._on_text_area_changed)
 		self.exclude_edit.textChanged.connect(self._trigger_save_config)
+		self.suffix_button_group.buttonToggled.connect(self._on_suffix_toggled)
 		# 树视图
 		self.file_tree.order_changed.connect(self._on_file_order_changed)
 		self.file_tree.itemSelectionChanged.connect(self._highlight_text_for_selection)
@@ -475,51 +862,112 @@ class ProjectPackerTool(QMainWindow):
 
 	# --- 配置管理 (与原版相同) ---
 	def _load_config(self):
+		self._sorted_suffix_keys_cache = None
 		try:
-			if os.path.exists(self.config_file_path):
-				with open(self.config_file_path, 'r', encoding='utf-8') as f:
-					self.config = json.load(f)
-				if not all(k in self.config for k in ['suffix_map', 'exclude_patterns', 'selected_suffixes']):
-					raise ValueError("Config file is missing required keys.")
-			else:
-				self._reset_config_to_defaults(save=False)
+			# 直接打开而不是先 os.path.exists 再打开，省去一次 stat
+			with open(self.config_file_path, 'rb') as f:
+				raw = f.read()
+			self.config = loads_json(raw)
+			if not all(k in self.config for k in ['suffix_map', 'exclude_patterns', 'selected_suffixes']):
+				raise ValueError("Config file is missing required keys.")
+			self._sanitize_config()
+			# 记住磁盘上的原始内容，保存时据此判断是否需要写入，无需再序列化一次
+			self._last_saved_payload = raw
+		except FileNotFoundError:
+			self._reset_config_to_defaults(save=False)
 		except (json.JSONDecodeError, ValueError, TypeError) as e:
 			logging.warning(f"加载或验证配置文件 '{self.config_file_path}' 失败: {e}. 重置为默认值。")
 			self._reset_config_to_defaults(save=False)
 		
-	def _save_config(self):
+	def _sanitize_config(self):
+		"""单次遍历过滤掉配置中类型不正确的条目 (顶层类型错误时抛出 TypeError)"""
+		suffix_map = self.config['suffix_map']
+		selected_suffixes = self.config['selected_suffixes']
+		if type(suffix_map) is not dict or type(selected_suffixes) is not list:
+			raise TypeError("suffix_map/selected_suffixes has wrong type.")
+
+		cleaned_map = {k: v for k, v in suffix_map.items() if type(k) is str and type(v) is dict}
+		if len(cleaned_map) != len(suffix_map):
+			logging.warning(f"配置中有 {len(suffix_map) - len(cleaned_map)} 个无效的后缀映射已被忽略。")
+			self.config['suffix_map'] = cleaned_map
+
+		cleaned_selected = [suffix for suffix in selected_suffixes if type(suffix) is str]
+		if len(cleaned_selected) != len(selected_suffixes):
+			self.config['selected_suffixes'] = cleaned_selected
+
+	def _save_config(self, save_window_state: bool = False):
+		# 立即保存会同时满足所有待处理的防抖保存
+		self._save_config_timer.stop()
+		self._config_dirty = False
 		try:
 			self.config['exclude_patterns'] = self.exclude_edit.text()
 			self.config['selected_suffixes'] = self._get_selected_suffixes()
-			self.config['window_geometry'] = self.saveGeometry().toBase64().data().decode('ascii')
-			self.config['splitter_state'] = self.center_and_right_splitter.saveState().toBase64().data().decode('ascii')
-			with open(self.config_file_path, 'w', encoding='utf-8') as f:
-				json.dump(self.config, f, indent=4, ensure_ascii=False)
+			if save_window_state: # 窗口布局只在退出时记录，输入触发的保存沿用已有值，省去序列化与 base64 编码
+				self.config['window_geometry'] = self.saveGeometry().toBase64().data().decode('ascii')
+				self.config['splitter_state'] = self.center_and_right_splitter.saveState().toBase64().data().decode('ascii')
+			payload = dumps_json(self.config)
+			if payload == self._last_saved_payload:
+				return # 内容与磁盘上一致，无需重复写入
+			# 先完整写入临时文件再原子替换，避免写到一半时崩溃导致配置损坏
+			tmp_path = self.config_file_path + '.tmp'
+			try:
+				with open(tmp_path, 'wb') as f:
+					f.write(payload)
+				os.replace(tmp_path, self.config_file_path)
+			except OSError:
+				if os.path.exists(tmp_path):
+					os.remove(tmp_path)
+				raise
+			self._last_saved_payload = payload
 			logging.info("配置已保存。")
-		except IOError as e:
+		except OSError as e:
 			logging.error(f"保存配置失败: {e}")
 			self.statusBar().showMessage("错误: 无法保存配置。", 3000)
 
 	def _trigger_save_config(self):
-		QTimer.singleShot(500, self._save_config)
+		"""
+		标记配置有修改。定时器只在空闲时启动、不随每次修改重启：
+		连续输入期间也会每 750ms 落盘一次，且不再为每次按键重置 Qt 定时器。
+		"""
+		self._config_dirty = True
+		if not self._save_config_timer.isActive():
+			self._save_config_timer.start()
+
+	def _save_pending_config(self):
+		"""防抖定时器到期：仅在确有未保存的修改时才保存"""
+		if self._config_dirty:
+			self._save_config()
 
 	def _reset_config_to_defaults(self, save=True):
 		self.config = {
-			'suffix_map': DEFAULT_SUFFIX_MAP.copy(),
+			'suffix_map': copy_default_suffix_map(),
 			'exclude_patterns': "*.log, *.tmp, build/, dist/, venv/, .git/, .vscode/, __pycache__/",
-			'selected_suffixes': list(DEFAULT_SUFFIX_MAP.keys()),
+			'selected_suffixes': list(DEFAULT_SUFFIXES),
 			'window_geometry': None,
 			'splitter_state': None
 		}
+		self._sorted_suffix_keys_cache = None
 		if save:
 			self._save_config()
 			self.statusBar().showMessage("配置已重置为默认值。", 2000)
 
+	@property
+	def _sorted_suffix_keys(self) -> List[str]:
+		"""按字母排序的后缀列表，仅在映射变化后重新排序"""
+		if self._sorted_suffix_keys_cache is None:
+			self._sorted_suffix_keys_cache = sorted(self.config['suffix_map'].keys())
+		return self._sorted_suffix_keys_cache
+
 	# --- UI 更新与同步 ---
 	def _update_ui_from_config(self):
 		self._block_signals = True
 		self.exclude_edit.setText(self.config.get('exclude_patterns', ''))
-		
+		self._update_suffix_map_display()
+		self._update_suffix_checkboxes()
+		self._block_signals = False
+
+	def _restore_window_state(self):
+		"""恢复上次保存的窗口几何信息和分割器状态"""
 		geometry_b64 = self.config.get('window_geometry')
 		if geometry_b64:
 			self.restoreGeometry(QByteArray.fromBase64(geometry_b64.encode('ascii')))
@@ -527,10 +975,6 @@ class ProjectPackerTool(QMainWindow):
 		splitter_state_b64 = self.config.get('splitter_state')
 		if splitter_state_b64:
 			self.center_and_right_splitter.restoreState(QByteArray.fromBase64(splitter_state_b64.encode('ascii')))
-			
-		self._update_suffix_map_display()
-		self._update_suffix_checkboxes()
-		self._block_signals = False
 
 	def _update_data_from_ui(self):
 		self._populate_tree_widget()
@@ -538,39 +982,64 @@ class ProjectPackerTool(QMainWindow):
 		self._update_button_states()
 
 	def _update_suffix_map_display(self):
-		display_text = [
-			f"{suffix:<10} -> {data.get('language', 'N/A'):<15} (注释: {data.get('comment', '无')})"
-			for suffix, data in sorted(self.config['suffix_map'].items())
-		]
-		self.suffix_map_display.setPlainText("\n".join(display_text))
+		suffix_map = self.config['suffix_map']
+		display_text = "\n".join(
+			f"{suffix:<10} -> {suffix_map[suffix].get('language', 'N/A'):<15} (注释: {suffix_map[suffix].get('comment', '无')})"
+			for suffix in self._sorted_suffix_keys
+		)
+		# 内容未变化时不重新设置文本，避免无谓的文档重建
+		if display_text != self._suffix_map_display_text:
+			self._suffix_map_display_text = display_text
+			self.suffix_map_display.setPlainText(display_text)
 
 	def _update_suffix_checkboxes(self):
-		"""根据配置动态创建和布局文件类型复选框"""
-		# 清理旧的复选框
-		while self.suffix_grid_layout.count():
-			item = self.suffix_grid_layout.takeAt(0)
-			widget = item.widget()
-			if widget:
-				widget.deleteLater()
-		self.suffix_checkboxes.clear()
-
-		all_suffixes = sorted(self.config['suffix_map'].keys())
-		selected_suffixes = self.config.get('selected_suffixes', [])
-
-		# 固定为4列，让其自动填充宽度
-		num_cols = 4
-
-		for i, suffix in enumerate(all_suffixes):
-			checkbox = QCheckBox(suffix)
-			checkbox.setChecked(suffix in selected_suffixes)
-			checkbox.stateChanged.connect(self._on_suffix_selection_changed)
-
-			row, col = divmod(i, num_cols)
-			self.suffix_grid_layout.addWidget(checkbox, row, col)
-			self.suffix_checkboxes.append(checkbox)
-
-		# 添加一个垂直的伸缩项，确保所有复选框都向上对齐
-		self.suffix_grid_layout.setRowStretch(len(all_suffixes) // num_cols + 1, 1)
+		"""根据配置增量更新文件类型复选框：保留仍存在的，移除的放入复用池，新增的优先从池中取"""
+		scroll_content = self.suffix_scroll_area.widget()
+		# 批量修改期间冻结重绘，避免每次插入都触发一次布局
+		scroll_content.setUpdatesEnabled(False)
+		try:
+			all_suffixes = self._sorted_suffix_keys
+			selected_suffixes = set(self.config.get('selected_suffixes', []))
+
+			# 先把现有复选框从网格中取出，删除已不存在的后缀
+			for suffix, checkbox in list(self.suffix_checkboxes.items()):
+				self.suffix_grid_layout.removeWidget(checkbox)
+				if suffix not in self.config['suffix_map']:
+					del self.suffix_checkboxes[suffix]
+					checkbox.hide()
+					self.suffix_button_group.removeButton(checkbox)
+					self._checkbox_pool.append(checkbox)
+
+			# 固定为4列，让其自动填充宽度
+			num_cols = 4
+
+			for i, suffix in enumerate(all_suffixes):
+				checkbox = self.suffix_checkboxes.get(suffix)
+				if checkbox is None:
+					if self._checkbox_pool:
+						checkbox = self._checkbox_pool.pop()
+						checkbox.setText(suffix)
+						checkbox.show()
+					else:
+						checkbox = QCheckBox(suffix)
+					self.suffix_button_group.addButton(checkbox)
+					self.suffix_checkboxes[suffix] = checkbox
+				# 同步勾选状态时不触发保存
+				with QSignalBlocker(self.suffix_button_group):
+					checkbox.setChecked(suffix in selected_suffixes)
+
+				row, col = divmod(i, num_cols)
+				self.suffix_grid_layout.addWidget(checkbox, row, col)
+
+			self._checked_suffixes = {suffix for suffix in all_suffixes if suffix in selected_suffixes}
+
+			# 添加一个垂直的伸缩项，确保所有复选框都向上对齐
+			if self._suffix_stretch_row >= 0:
+				self.suffix_grid_layout.setRowStretch(self._suffix_stretch_row, 0)
+			self._suffix_stretch_row = len(all_suffixes) // num_cols + 1
+			self.suffix_grid_layout.setRowStretch(self._suffix_stretch_row, 1)
+		finally:
+			scroll_content.setUpdatesEnabled(True)
 	
 	# --- 核心逻辑 (多线程改造) ---
 	def _run_extraction(self):
@@ -588,44 +1057,61 @@ class ProjectPackerTool(QMainWindow):
 			QMessageBox.warning(self, "输入错误", "请至少选择一种文件类型进行打包。")
 			return
 
-		exclude_patterns = self._parse_exclusions(self.exclude_edit.text())
-		all_filepaths = self._gather_source_files(source_path, exclude_patterns)
+		exclusions = compile_exclusions(self.exclude_edit.text())
+		suffix_map = dict(self.config['suffix_map']) # 传给工作线程的快照，避免跨线程读取配置
 
-		self._set_ui_for_task(True, "正在打包文件...", len(all_filepaths))
+		# 目录扫描也在工作线程中进行，扫描期间进度条为忙碌状态
+		self._set_ui_for_task(True, "正在扫描源目录...", 0)
 		
-		self.worker = Worker(self._task_extraction, source_path, selected_suffixes, all_filepaths)
+		self.worker = Worker(self._task_extraction, source_path, selected_suffixes, exclusions, suffix_map)
 		self.worker.progress.connect(self._update_progress)
+		self.worker.total_changed.connect(self._set_progress_total)
 		self.worker.finished.connect(self._on_extraction_finished)
 		self.worker.error.connect(self._on_task_error)
 		self.worker.start()
 
-	def _task_extraction(self, worker: Worker, source_path: str, selected_suffixes: List[str], all_filepaths: List[str]) -> Tuple[List[FileInfo], Dict]:
-		new_file_data = []
-		stats = {"extracted": 0, "skipped_type": 0, "error": 0}
-		for i, fpath in enumerate(all_filepaths):
-			if worker.is_cancelled: break
-			worker.progress.emit(i, os.path.basename(fpath))
-
-			_, suffix = os.path.splitext(fpath)
-			if suffix.lower() not in selected_suffixes:
-				stats["skipped_type"] += 1
-				continue
-
-			map_entry = self.config['suffix_map'].get(suffix.lower())
+	def _task_extraction(self, worker: Worker, source_path: str, selected_suffixes: List[str],
+						 exclusions: ExclusionMatcher, suffix_map: Dict[str, dict]) -> Tuple[List[FileInfo], Dict]:
+		# 后缀筛选在扫描时进行，未选中的文件不做排除规则匹配
+		all_filepaths, skipped_type = self._gather_source_files(source_path, exclusions, worker, selected_suffixes)
+		if worker.is_cancelled:
+			return None
+
+		stats = {"extracted": 0, "skipped_type": skipped_type, "error": 0}
+		candidates = [] # 需要读取的 (完整路径, 相对路径, 映射项)
+		splitext = os.path.splitext
+		for fpath, rel_path in all_filepaths:
+			map_entry = suffix_map.get(splitext(rel_path[rel_path.rfind('/') + 1:])[1].lower())
 			if map_entry:
-				try:
-					with open(fpath, 'r', encoding='utf-8', errors='ignore') as f:
-						content = f.read()
-					rel_path = os.path.relpath(fpath, source_path).replace(os.sep, '/')
-					new_file_data.append(FileInfo(
-						rel_path=rel_path, content=content,
-						language=map_entry.get('language', 'text'),
-						comment_symbol=map_entry.get('comment', '#')
-					))
-					stats["extracted"] += 1
-				except Exception as e:
-					logging.error(f"无法读取文件 {fpath}: {e}")
-					stats["error"] += 1
+				candidates.append((fpath, rel_path, map_entry))
+		worker.total_changed.emit(len(candidates))
+
+		# 读取是 I/O 密集的，分批交给线程池并发读取；按提交顺序取回结果，输出顺序不变
+		batches = [candidates[i:i + READ_BATCH_SIZE] for i in range(0, len(candidates), READ_BATCH_SIZE)]
+		new_file_data = []
+		index = 0
+		emit_step = max(1, len(candidates) // PROGRESS_EMIT_COUNT)
+		last_index = len(candidates) - 1
+		with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+			results = pool.map(read_text_files, ([fpath for fpath, _, _ in batch] for batch in batches))
+			for batch, contents in zip(batches, results):
+				if worker.is_cancelled:
+					pool.shutdown(wait=False, cancel_futures=True)
+					break
+				for (fpath, rel_path, map_entry), content in zip(batch, contents):
+					if index % emit_step == 0 or index == last_index:
+						worker.progress.emit(index, rel_path[rel_path.rfind('/') + 1:])
+					index += 1
+					if isinstance(content, str):
+						new_file_data.append(FileInfo(
+							rel_path=rel_path, content=content,
+							language=map_entry.get('language', 'text'),
+							comment_symbol=map_entry.get('comment', '#')
+						))
+						stats["extracted"] += 1
+					else:
+						logging.error(f"无法读取文件 {fpath}: {content}")
+						stats["error"] += 1
 		return new_file_data, stats
 
 	def _on_extraction_finished(self, result: Tuple[List[FileInfo], Dict]):
@@ -653,7 +1139,7 @@ class ProjectPackerTool(QMainWindow):
 			QMessageBox.warning(self, "输入错误", "请选择一个输出目录，并确保文件树中有文件。")
 			return
 
-		if os.path.exists(output_path) and os.listdir(output_path):
+		if dir_nonempty(output_path):
 			reply = QMessageBox.question(self, "确认覆盖", f"输出目录 '{output_path}' 非空，文件可能被覆盖。\n是否继续？",
 										 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
 			if reply != QMessageBox.StandardButton.Yes: return
@@ -662,26 +1148,50 @@ class ProjectPackerTool(QMainWindow):
 		
 		self.worker = Worker(self._task_reconstruction, output_path, self.file_data)
 		self.worker.progress.connect(self._update_progress)
+		self.worker.total_changed.connect(self._set_progress_total)
 		self.worker.finished.connect(self._on_reconstruction_finished)
 		self.worker.error.connect(self._on_task_error)
 		self.worker.start()
 
 	def _task_reconstruction(self, worker: Worker, output_path: str, file_data: List[FileInfo]) -> Dict:
 		stats = {"created": 0, "error": 0, "invalid_path": 0}
-		for i, file_info in enumerate(file_data):
-			if worker.is_cancelled: break
-			worker.progress.emit(i, file_info.rel_path)
 
-			if ".." in file_info.rel_path.split('/') or INVALID_PATH_CHARS_PATTERN.search(file_info.rel_path):
+		# 先校验全部路径，得到要写入的 (文件信息, 完整路径)
+		targets = []
+		for file_info in file_data:
+			# 统一成 '/' 后用子串检查 ".." 段 (不构造列表)，并拒绝会让 os.path.join 丢弃输出目录的绝对路径
+			norm_path = file_info.rel_path.replace('\\', '/')
+			if (norm_path == '..' or norm_path.startswith(('/', '../')) or norm_path.endswith('/..') or '/../' in norm_path
+					or os.path.isabs(file_info.rel_path) or INVALID_PATH_CHARS_PATTERN.search(file_info.rel_path)):
 				logging.warning(f"检测到无效或不安全的路径，已跳过: {file_info.rel_path}")
 				stats["invalid_path"] += 1
 				continue
-			
+			targets.append((file_info, os.path.join(output_path, file_info.rel_path)))
+
+		# 父目录去重后按路径长度 (浅层优先) 一次性创建，写文件时不再检查目录；
+		# 目录很多时也要能取消并显示进度，进度条先按目录数计
+		parent_dirs = sorted({os.path.dirname(full_path) for _, full_path in targets}, key=len)
+		worker.total_changed.emit(len(parent_dirs))
+		emit_step = max(1, len(parent_dirs) // PROGRESS_EMIT_COUNT)
+		last_index = len(parent_dirs) - 1
+		for i, parent_dir in enumerate(parent_dirs):
+			if worker.is_cancelled: return stats
+			if i % emit_step == 0 or i == last_index:
+				worker.progress.emit(i, parent_dir)
 			try:
-				full_path = os.path.join(output_path, file_info.rel_path)
-				os.makedirs(os.path.dirname(full_path), exist_ok=True)
-				with open(full_path, 'w', encoding='utf-8', newline='\n') as f:
-					f.write(file_info.content)
+				os.makedirs(parent_dir, exist_ok=True)
+			except OSError as e:
+				logging.error(f"无法创建目录 {parent_dir}: {e}") # 其中的文件会在写入时计为错误
+
+		worker.total_changed.emit(len(targets))
+		emit_step = max(1, len(targets) // PROGRESS_EMIT_COUNT)
+		last_index = len(targets) - 1
+		for i, (file_info, full_path) in enumerate(targets):
+			if worker.is_cancelled: break
+			if i % emit_step == 0 or i == last_index:
+				worker.progress.emit(i, file_info.rel_path)
+			try:
+				write_text_file(full_path, file_info.content)
 				stats["created"] += 1
 			except (IOError, OSError) as e:
 				logging.error(f"无法写入文件 {file_info.rel_path}: {e}")
@@ -708,21 +1218,53 @@ class ProjectPackerTool(QMainWindow):
 		self.clear_all_btn.setDisabled(is_running)
 		
 		if is_running:
-			self.progress_dialog = QProgressDialog(progress_title, "取消", 0, max_value, self)
-			self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-			self.progress_dialog.canceled.connect(self._cancel_task)
-			self.progress_dialog.show()
+			progress_dialog = self._get_progress_dialog()
+			progress_dialog.reset()
+			progress_dialog.setLabelText(progress_title)
+			progress_dialog.setRange(0, max_value)
+			progress_dialog.setValue(0)
+			progress_dialog.show()
 		elif self.progress_dialog:
-			self.progress_dialog.close()
-			self.progress_dialog = None
+			# 复用同一个对话框: 只重置并隐藏。close() 会额外发射 canceled 信号
+			self.progress_dialog.reset()
+			self.progress_dialog.hide()
 		
 		self._update_button_states() # 重新评估其他按钮状态
 
+	def _get_progress_dialog(self) -> QProgressDialog:
+		"""延迟创建并复用同一个进度对话框，避免每次任务都构造新的顶层窗口"""
+		if self.progress_dialog is None:
+			self.progress_dialog = QProgressDialog("", "取消", 0, 0, self)
+			self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+			self.progress_dialog.setAutoReset(False)
+			self.progress_dialog.setAutoClose(False)
+			self.progress_dialog.canceled.connect(self._cancel_task)
+			self.progress_dialog.reset()
+			self.progress_dialog.hide()
+		return self.progress_dialog
+
+	def _is_progress_visible(self) -> bool:
+		return self.progress_dialog is not None and self.progress_dialog.isVisible()
+
 	def _update_progress(self, value: int, label: str):
-		if self.progress_dialog:
-			self.progress_dialog.setValue(value)
+		"""节流更新进度对话框：数值最多约 60 次/秒，文字最多约 4 次/秒 (setLabelText 会触发重新布局)"""
+		if not self._is_progress_visible():
+			return
+		now = time.monotonic()
+		is_last = value >= self.progress_dialog.maximum() - 1
+		if now - self._last_progress_ts < 0.016 and not is_last:
+			return
+		self._last_progress_ts = now
+		self.progress_dialog.setValue(value)
+		if now - self._last_progress_label_ts >= 0.25 or is_last:
+			self._last_progress_label_ts = now
 			self.progress_dialog.setLabelText(f"处理中: {label}...")
 
+	def _set_progress_total(self, total: int):
+		# 只更新总量；打包和重建共用此槽，标签由随后的进度更新给出
+		if self._is_progress_visible():
+			self.progress_dialog.setMaximum(total)
+
 	def _cancel_task(self):
 		if self.worker:
 			self.worker.cancel()
@@ -735,29 +1277,50 @@ class ProjectPackerTool(QMainWindow):
 		self.statusBar().showMessage("任务执行出错。", 5000)
 		
 	def _parse_text_to_tree(self):
+		if self.worker and self.worker.isRunning():
+			QMessageBox.information(self, "任务正在进行", "已有任务在后台运行，请稍候。")
+			return
+
+		self._flush_pending_regeneration() # 否则会解析旧文本并覆盖刚做的拖放调整
 		full_content = self.text_area.toPlainText()
 		if not full_content.strip():
 			QMessageBox.warning(self, "无输入", "文本区域是空的。")
 			return
 
+		# 大文本的正则解析放到工作线程，界面保持响应
+		self._set_ui_for_task(True, "正在解析文本...", 0)
+
+		self.worker = Worker(self._task_parse_text, full_content)
+		self.worker.finished.connect(self._on_parse_finished)
+		self.worker.error.connect(self._on_task_error)
+		self.worker.start()
+
+	def _task_parse_text(self, worker: Worker, full_content: str) -> List[FileInfo]:
 		path_to_info_map: Dict[str, FileInfo] = {}
 		
-		for match in CODE_BLOCK_PATTERN.finditer(full_content):
-			language = match.group(1)
-			block_content = match.group(2).strip()
+		for language, block_content in iter_code_blocks(full_content):
+			if worker.is_cancelled: break
+			block_content = block_content.strip()
 			
-			first_line = block_content.split('\n', 1)[0]
-			path_match = PATH_COMMENT_PATTERN.match(first_line)
+			# 用 endpos 把匹配限制在首行，不必先切出首行字符串
+			first_nl = block_content.find('\n')
+			path_match = PATH_COMMENT_PATTERN.match(block_content, 0, first_nl if first_nl >= 0 else len(block_content))
 			
 			if path_match:
 				comment_symbol = path_match.group(1) or ''
-				rel_path = path_match.group(2).strip()
-				content = block_content.split('\n', 1)[1] if '\n' in block_content else ''
+				rel_path = path_match.group(2) # (\S+) 不含空白，无需再 strip
+				content = block_content[first_nl + 1:] if first_nl >= 0 else ''
 				path_to_info_map[rel_path] = FileInfo(rel_path, content, language, comment_symbol)
 			else:
 				logging.warning(f"跳过语言为'{language}'的代码块，因缺少有效的路径注释。")
 
-		self.file_data = list(path_to_info_map.values())
+		return list(path_to_info_map.values())
+
+	def _on_parse_finished(self, file_data: List[FileInfo]):
+		self._set_ui_for_task(False)
+		if file_data is None: return # Canceled or Error
+
+		self.file_data = file_data
 		self._update_data_from_ui()
 		self.statusBar().showMessage(f"从文本中解析出 {len(self.file_data)} 个文件。", 3000)
 
@@ -784,7 +1347,9 @@ class ProjectPackerTool(QMainWindow):
 					# 重新计算并更新相对路径
 					filename = os.path.basename(file_info.rel_path)
 					new_rel_path = os.path.join(new_dir, filename).replace(os.sep, '/')
-					file_info.rel_path = new_rel_path
+					if new_rel_path != file_info.rel_path:
+						file_info.rel_path = new_rel_path
+						file_info.rendered_block = file_info.render_block() # 路径注释随路径变化
 					
 					# 更新UI: 第一列只显示文件名，完整路径在Tooltip中
 					item.setText(0, filename)
@@ -794,9 +1359,20 @@ class ProjectPackerTool(QMainWindow):
 			iterator += 1
 
 		self.file_data = new_file_data
-		self._regenerate_combined_text()
+		self._block_ranges = None # 重建前预览仍是旧文本，高亮改用全文搜索
+		self._regen_timer.start()
 		self.statusBar().showMessage("文件顺序和结构已更新。", 1500)
 
+	def _on_suffix_toggled(self, checkbox: QAbstractButton, checked: bool):
+		"""单个后缀复选框状态变化时，增量更新勾选缓存"""
+		# 复选框可能被复用于其他后缀，因此以其当前文本为准
+		suffix = checkbox.text()
+		if checked:
+			self._checked_suffixes.add(suffix)
+		else:
+			self._checked_suffixes.discard(suffix)
+		self._on_suffix_selection_changed()
+
 	def _on_suffix_selection_changed(self):
 		if not self._block_signals:
 			self._trigger_save_config()
@@ -814,6 +1390,7 @@ class ProjectPackerTool(QMainWindow):
 		dialog = SuffixMapEditorDialog(self.config['suffix_map'], self)
 		if dialog.exec():
 			self.config['suffix_map'] = dialog.get_edited_map()
+			self._sorted_suffix_keys_cache = None
 			self._update_ui_from_config()
 			self._save_config()
 			self.statusBar().showMessage("后缀映射已更新。", 2000)
@@ -830,7 +1407,7 @@ class ProjectPackerTool(QMainWindow):
 	def _show_tree_context_menu(self, position):
 		"""在文件树上显示右键上下文菜单"""
 		menu = QMenu(self)
-		delete_action = menu.addAction(QIcon(":/icons/clear-all.svg"), "删除选中项")
+		delete_action = menu.addAction(get_icon(":/icons/clear-all.svg"), "删除选中项")
 		
 		# 仅当有选中项时才启用删除操作
 		delete_action.setEnabled(bool(self.file_tree.selectedItems()))
@@ -885,7 +1462,20 @@ class ProjectPackerTool(QMainWindow):
 		
 	def _populate_tree_widget(self):
 		"""根据 self.file_data 刷新文件树视图，支持文件夹层级"""
-		self.file_tree.clear()
+		# 先在树外组装好全部项 (未挂到树上的项增删子项不会触发模型通知)，最后一次性插入
+		self.file_tree.setUpdatesEnabled(False)
+		try:
+			self.file_tree.clear()
+			self.file_tree.addTopLevelItems(self._build_tree_items())
+			# 默认展开所有文件夹以便查看
+			self.file_tree.expandAll()
+			# 调整列宽以适应内容
+			self.file_tree.resizeColumnToContents(0)
+		finally:
+			self.file_tree.setUpdatesEnabled(True)
+
+	def _build_tree_items(self) -> List[QTreeWidgetItem]:
+		"""按 self.file_data 构建文件夹项 (含文件子项) 列表，保持首次出现的顺序"""
 		folder_items = {}  # 存储文件夹QTreeWidgetItem的字典
 
 		for file_info in self.file_data:
@@ -897,10 +1487,9 @@ class ProjectPackerTool(QMainWindow):
 			if not folder_item:
 				# 创建文件夹项
 				folder_item = QTreeWidgetItem([display_dir])
-				folder_item.setIcon(0, QIcon(":/icons/browse-folder.svg"))
+				folder_item.setIcon(0, get_icon(":/icons/browse-folder.svg"))
 				# 允许文件夹接收拖放，但不允许成为其他项的子项
 				folder_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled | Qt.ItemFlag.ItemIsEnabled)
-				self.file_tree.addTopLevelItem(folder_item)
 				folder_items[display_dir] = folder_item
 
 			# 创建文件项
@@ -916,48 +1505,60 @@ class ProjectPackerTool(QMainWindow):
 			
 			folder_item.addChild(item)
 
-		# 默认展开所有文件夹以便查看
-		self.file_tree.expandAll()
-		# 调整列宽以适应内容
-		self.file_tree.resizeColumnToContents(0)
+		return list(folder_items.values())
 
 	def _regenerate_combined_text(self):
-		"""根据 self.file_data 生成合并后的文本，并避免重复添加路径注释"""
-		blocks = []
+		"""根据 self.file_data 生成合并后的文本并一次性写入预览区"""
+		self._regen_timer.stop() # 立即重建会满足待处理的延迟重建
+		# 注: 实测分块 insertText 比单次 setPlainText 慢 3~4 倍，因此保留一次性设置，
+		# 仅在设置期间冻结重绘，使大文本只触发一次绘制
+		# 拼接时顺便记录每个代码块的位置，选中文件时可直接定位而不必搜索全文
+		block_ranges = {}
+		position = 0
 		for file_info in self.file_data:
-			content_to_write = file_info.content.strip()
-			
-			# 构造预期的注释行
-			expected_comment = ""
-			if "<!--" in file_info.comment_symbol:
-				expected_comment = f"<!-- {file_info.rel_path} -->"
-			elif file_info.comment_symbol:
-				expected_comment = f"{file_info.comment_symbol} {file_info.rel_path}"
-
-			# 检查内容是否已经以该注释行开头。
-			# 如果是，则从内容中移除它，因为我们会在外面统一添加，以确保格式统一。
-			if expected_comment and content_to_write.startswith(expected_comment):
-				content_to_write = content_to_write[len(expected_comment):].lstrip()
-			
-			# 统一添加注释行（如果需要）
-			final_comment_line = f"{expected_comment}\n" if expected_comment else ""
-
-			block = (f"```{file_info.language}\n"
-					 f"{final_comment_line}"
-					 f"{content_to_write}\n"
-					 "```\n")
-			blocks.append(block)
-		
+			end = position + utf16_len(file_info.rendered_block)
+			block_ranges.setdefault(file_info.rel_path, (position, end - 1)) # 不含块末换行
+			position = end + 1 # 块间的 "\n"
 		self.text_area.blockSignals(True)
-		self.text_area.setPlainText("\n".join(blocks))
-		self.text_area.blockSignals(False)
+		self.text_area.setUpdatesEnabled(False)
+		try:
+			self.text_area.setPlainText("\n".join(file_info.rendered_block for file_info in self.file_data))
+		finally:
+			self.text_area.setUpdatesEnabled(True)
+			self.text_area.blockSignals(False)
+		self._block_ranges = block_ranges
 		self._update_button_states()
 
+	def _flush_pending_regeneration(self):
+		"""拖放后尚未重建的预览立即重建，保证读取预览文本的操作拿到的是最新顺序"""
+		if self._regen_timer.isActive():
+			self._regenerate_combined_text()
+
+	def _on_text_area_changed(self):
+		# 文本被编辑 (或清空) 后，记录的代码块位置不再可靠
+		self._block_ranges = None
+		self._update_button_states()
+
+	def _isdir_cached(self, path: str) -> bool:
+		"""带缓存的 os.path.isdir，只有路径文本变化时才重新访问文件系统"""
+		cached = self._dir_status_cache
+		if cached is not None and cached[0] == path:
+			return cached[1]
+		is_dir = os.path.isdir(path)
+		self._dir_status_cache = (path, is_dir)
+		return is_dir
+
+	def _on_source_dir_changed(self, path: str):
+		# 用户修改了路径，丢弃旧结果，确保停止输入后重新检查一次
+		self._dir_status_cache = None
+		self._source_dir_timer.start()
+
 	def _update_button_states(self):
-		is_source_valid = os.path.isdir(self.source_dir_edit.text())
+		is_source_valid = self._isdir_cached(self.source_dir_edit.text())
 		is_output_valid = bool(self.output_dir_edit.text())
 		has_files_in_tree = bool(self.file_data)
-		has_text = bool(self.text_area.toPlainText().strip())
+		# isEmpty() 是常数时间的判断，避免每次按键都把整个文档复制成 Python 字符串
+		has_text = not self.text_area.document().isEmpty()
 		
 		self.extract_btn.setEnabled(is_source_valid)
 		self.reconstruct_btn.setEnabled(has_files_in_tree and is_output_valid)
@@ -980,6 +1581,16 @@ class ProjectPackerTool(QMainWindow):
 		file_info = item.data(0, Qt.ItemDataRole.UserRole)
 		if not file_info: return
 
+		block_range = self._block_ranges.get(file_info.rel_path) if self._block_ranges is not None else None
+		if block_range is not None:
+			selection_cursor = QTextCursor(self.text_area.document())
+			selection_cursor.setPosition(block_range[0])
+			selection_cursor.setPosition(block_range[1], QTextCursor.MoveMode.KeepAnchor)
+			self.text_area.setTextCursor(selection_cursor)
+			self.text_area.ensureCursorVisible()
+			return
+
+		# 文本已被手动编辑，回退到全文搜索
 		search_str = f"```{file_info.language}"
 		doc = self.text_area.document()
 		
@@ -996,7 +1607,7 @@ class ProjectPackerTool(QMainWindow):
 				block_start_cursor = QTextCursor(cursor)
 				block_start_cursor.movePosition(QTextCursor.MoveOperation.StartOfLine)
 				
-				block_end_cursor = doc.find("```", block_start_cursor)
+				block_end_cursor = doc.find("```", check_cursor) # 从下一行开始找结束标记，跳过开头的 ```
 				if not block_end_cursor.isNull():
 					block_end_cursor.movePosition(QTextCursor.MoveOperation.EndOfLine)
 					
@@ -1008,108 +1619,123 @@ class ProjectPackerTool(QMainWindow):
 				return
 
 	def _get_icon_for_file(self, filename: str) -> QIcon:
-		"""根据文件名后缀返回一个内嵌的资源图标 (已更新)"""
+		"""根据文件名后缀返回一个内嵌的资源图标 (同一图标只解析一次)"""
 		ext = os.path.splitext(filename)[1].lower()
-		icon_path = FILE_ICON_MAP.get(ext, FILE_ICON_MAP['default'])
-		return QIcon(icon_path)
+		return get_icon(FILE_ICON_MAP.get(ext, FILE_ICON_MAP['default']))
 
 	# --- 通用辅助方法 (与原版相同, 细微调整) ---
+	def _get_dir_dialog(self) -> QFileDialog:
+		"""延迟创建非原生目录对话框并复用，避免每次都启动系统原生对话框"""
+		if self._dir_dialog is None:
+			self._dir_dialog = QFileDialog(self)
+			self._dir_dialog.setFileMode(QFileDialog.FileMode.Directory)
+			self._dir_dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
+			self._dir_dialog.setOption(QFileDialog.Option.DontUseNativeDialog, True)
+		return self._dir_dialog
+
+	def _get_save_dialog(self) -> QFileDialog:
+		"""延迟创建非原生保存对话框并复用，目录和筛选器在两次调用之间保留"""
+		if self._save_dialog is None:
+			self._save_dialog = QFileDialog(self, "保存合并文本")
+			self._save_dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
+			self._save_dialog.setNameFilter("Markdown 文件 (*.md);;文本文件 (*.txt);;所有文件 (*)")
+			self._save_dialog.setOption(QFileDialog.Option.DontUseNativeDialog, True)
+			# 非原生对话框不会自动补扩展名，按当前筛选器补上
+			self._save_dialog.setDefaultSuffix("md")
+			self._save_dialog.filterSelected.connect(self._on_save_filter_selected)
+		return self._save_dialog
+
+	def _on_save_filter_selected(self, name_filter: str):
+		match = re.search(r"\(\*\.(\w+)\)", name_filter)
+		self._save_dialog.setDefaultSuffix(match.group(1) if match else "")
+
 	def _browse_directory(self, line_edit: QLineEdit, title: str):
-		directory = QFileDialog.getExistingDirectory(self, title, line_edit.text())
-		if directory:
-			line_edit.setText(os.path.abspath(directory))
+		dialog = self._get_dir_dialog()
+		dialog.setWindowTitle(title)
+		if line_edit.text():
+			dialog.setDirectory(line_edit.text())
+		if dialog.exec():
+			line_edit.setText(os.path.abspath(dialog.selectedFiles()[0]))
 			
 	def _save_text_to_file(self):
-		path, _ = QFileDialog.getSaveFileName(self, "保存合并文本", "", "Markdown 文件 (*.md);;文本文件 (*.txt);;所有文件 (*)")
-		if path:
-			try:
-				with open(path, 'w', encoding='utf-8', newline='\n') as f:
-					f.write(self.text_area.toPlainText())
-				self.statusBar().showMessage(f"文本已保存到 {os.path.basename(path)}", 3000)
-			except IOError as e:
-				QMessageBox.critical(self, "保存错误", f"无法保存文件:\n{e}")
+		self._flush_pending_regeneration()
+		dialog = self._get_save_dialog()
+		if not dialog.exec(): return
+		path = dialog.selectedFiles()[0]
+		try:
+			# 分段编码后顺序写入，不再同时持有整份文本和整份编码结果；
+			# 二进制模式跳过换行转换 (文档内部本就使用 '\n')
+			text = self.text_area.toPlainText()
+			with open(path, 'wb') as f:
+				for start in range(0, len(text), SAVE_CHUNK_CHARS):
+					f.write(text[start:start + SAVE_CHUNK_CHARS].encode('utf-8'))
+			self.statusBar().showMessage(f"文本已保存到 {os.path.basename(path)}", 3000)
+		except IOError as e:
+			QMessageBox.critical(self, "保存错误", f"无法保存文件:\n{e}")
 
 	def _copy_text_to_clipboard(self):
+		self._flush_pending_regeneration()
 		clipboard = QApplication.clipboard()
 		clipboard.setText(self.text_area.toPlainText())
 		self.statusBar().showMessage("已复制到剪切板。", 2000)
 
 	def _get_selected_suffixes(self) -> List[str]:
 		"""获取所有被选中的后缀名"""
-		return [cb.text() for cb in self.suffix_checkboxes if cb.isChecked()]
+		return sorted(self._checked_suffixes)
 
 	def _set_all_suffixes_checked(self, checked: bool):
 		"""全选或全不选所有后缀"""
-		self._block_signals = True
-		for checkbox in self.suffix_checkboxes:
-			checkbox.setChecked(checked)
-		self._block_signals = False
-		# 手动触发一次更新，以保存配置
-		self._on_suffix_selection_changed()
-
-	def _parse_exclusions(self, exclude_str: str) -> List[str]:
-		"""解析排除字符串为模式列表，忽略空行和注释。"""
-		patterns = []
-		# 支持逗号和换行符作为分隔符
-		delimiters = re.compile(r'[,\n]')
-		for line in delimiters.split(exclude_str):
-			line = line.strip()
-			if line and not line.startswith('#'):
-				patterns.append(line)
-		return patterns
-
-	def _gather_source_files(self, root_dir: str, exclude_patterns: List[str]) -> List[str]:
-		"""搜集源文件，使用 .gitignore 风格的排除规则。"""
-		filepaths = []
-		for root, dirs, files in os.walk(root_dir, topdown=True):
-			# 必须先处理目录，这样可以避免进入被排除的目录
-			dirs[:] = [d for d in dirs if not self._is_excluded(os.path.join(root, d), root_dir, exclude_patterns)]
-			for name in files:
-				fpath = os.path.join(root, name)
-				if not self._is_excluded(fpath, root_dir, exclude_patterns):
-					filepaths.append(fpath)
-		return filepaths
-
-	def _is_excluded(self, path: str, root: str, patterns: List[str]) -> bool:
+		# 在源头屏蔽按钮组的信号，而不是发射后再由标志位忽略
+		with QSignalBlocker(self.suffix_button_group):
+			for checkbox in self.suffix_checkboxes.values():
+				checkbox.setChecked(checked)
+		self._checked_suffixes = set(self.suffix_checkboxes) if checked else set()
+		# 手动触发一次保存
+		self._trigger_save_config()
+
+	def _gather_source_files(self, root_dir: str, exclusions: ExclusionMatcher, worker: Optional[Worker] = None,
+							 suffixes: Optional[List[str]] = None) -> Tuple[List[Tuple[str, str]], int]:
 		"""
-		检查路径是否匹配 .gitignore 风格的模式。
-		- 后匹配的规则会覆盖先匹配的规则。
-		- `!` 前缀表示否定匹配。
-		- `/` 后缀表示只匹配目录。
+		搜集源文件，返回 ((完整路径, 以 '/' 分隔的相对路径) 列表, 因后缀跳过的文件数)，使用 .gitignore 风格的排除规则。
+		基于 os.scandir: 目录类型取自 DirEntry 缓存，相对路径逐层拼接，顺序与 os.walk 自顶向下一致。
+		传入 suffixes 时先按后缀筛选文件，未选中的文件不再做排除规则匹配。
+		传入 worker 时，每进入一个目录检查一次取消请求。
 		"""
-		rel_path = os.path.relpath(path, root).replace(os.sep, '/')
-		is_dir = os.path.isdir(path)
-		
-		excluded = False
-		for pattern in patterns:
-			negate = pattern.startswith('!')
-			if negate:
-				pattern = pattern[1:]
-
-			# 规范化模式：移除尾部斜杠，但记录下来
-			is_dir_pattern = pattern.endswith('/')
-			if is_dir_pattern:
-				pattern = pattern.rstrip('/')
-
-			# 如果是目录模式，但当前路径不是目录，则跳过
-			if is_dir_pattern and not is_dir:
-				continue
-
-			# 检查匹配
-			match = False
-			# 模式不含斜杠，匹配任意层级的基本名称
-			if '/' not in pattern:
-				if fnmatch.fnmatch(os.path.basename(rel_path), pattern):
-					match = True
-			# 模式包含斜杠，从根开始匹配
-			else:
-				if fnmatch.fnmatch(rel_path, pattern):
-					match = True
-			
-			if match:
-				excluded = not negate
-				
-		return excluded
+		filepaths = []
+		skipped_type = 0
+		suffix_set = frozenset(suffixes) if suffixes is not None else None # 逐文件判断，用集合代替列表成员检查
+		splitext = os.path.splitext
+		is_excluded = exclusions.is_excluded
+		pending = [(root_dir, '')] # 待访问的 (目录路径, 相对路径前缀)
+		while pending:
+			if worker and worker.is_cancelled: break
+			dir_path, rel_prefix = pending.pop()
+			try:
+				with os.scandir(dir_path) as it:
+					entries = list(it)
+			except OSError:
+				continue # 与 os.walk 一样忽略无法读取的目录
+
+			subdirs = []
+			for entry in entries:
+				name = entry.name
+				try:
+					is_dir = entry.is_dir()
+				except OSError:
+					is_dir = False
+				if not is_dir and suffix_set is not None and splitext(name)[1].lower() not in suffix_set:
+					skipped_type += 1
+					continue
+				rel_path = rel_prefix + name
+				# 被排除的目录直接不进入
+				if is_excluded(rel_path, name, is_dir):
+					continue
+				if not is_dir:
+					filepaths.append((entry.path, rel_path))
+				elif not entry.is_symlink(): # 与 os.walk(followlinks=False) 一致，不进入目录链接
+					subdirs.append((entry.path, rel_path + '/'))
+			pending.extend(reversed(subdirs))
+		return filepaths, skipped_type
 
 	def closeEvent(self, event):
 		if self.worker and self.worker.isRunning():
@@ -1122,17 +1748,22 @@ class ProjectPackerTool(QMainWindow):
 				event.ignore()
 				return
 		
-		self._save_config()
+		if self._init_finished: # 界面尚未从配置填充时不要用空值覆盖配置
+			self._save_config(save_window_state=True)
 		super().closeEvent(event)
 
 	# --- 界面样式 (全新设计) ---
 	def _apply_styles(self):
 		"""从外部文件加载并应用QSS样式表"""
+		cls = type(self)
+		if cls._cached_style_sheet is not None:
+			self.setStyleSheet(cls._cached_style_sheet)
+			return
 		try:
 			style_path = get_resource_path('style.qss')
 			with open(style_path, 'r', encoding='utf-8') as f:
-				style_sheet = f.read()
-			self.setStyleSheet(style_sheet)
+				cls._cached_style_sheet = f.read()
+			self.setStyleSheet(cls._cached_style_sheet)
 		except FileNotFoundError:
 			logging.error("样式文件 'style.qss' 未找到。请确保它与主程序在同一目录下。")
 			# 提供一个基础的回退样式
@@ -1145,6 +1776,13 @@ if __name__ == "__main__":
 	logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 	
 	app = QApplication(sys.argv)
+
+	# 一次性安装 Qt 自带的中文翻译，使标准对话框按钮 (确定/是/否/取消) 显示中文，
+	# 无需为每个消息框单独改写按钮文字。找不到翻译文件时保持英文
+	qt_translator = QTranslator(app)
+	if qt_translator.load(QLocale(QLocale.Language.Chinese, QLocale.Country.China), "qtbase", "_",
+						  QLibraryInfo.path(QLibraryInfo.LibraryPath.TranslationsPath)):
+		app.installTranslator(qt_translator)
 	
 	window = ProjectPackerTool()
 	window.show()